@@ -1,14 +1,19 @@
 import os
-import pickle
 import contextlib
+import concurrent.futures
+import pickle
+import array
 import heapq
+import queue
+import threading
 import time
 import re
+import numpy as np
 from nltk.corpus import stopwords
 from porter2stemmer import Porter2Stemmer
 
 from index import InvertedIndexReader, InvertedIndexWriter
-from util import IdMap, QueryParser, sort_diff_list, sort_intersect_list, sort_union_list
+from util import IdMap, QueryParser
 from compression import VBEPostings, Simple8bPostings
 
 """ 
@@ -17,6 +22,206 @@ pip intall tqdm
 """
 from tqdm import tqdm
 
+"""
+Numba bersifat opsional: kalau tersedia, tokenisasi memakai kernel @njit yang
+berjalan langsung di atas bytes dokumen tanpa interpreter loop; kalau tidak,
+fallback ke tokenisasi regex biasa.
+"""
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+"""
+PyStemmer (package "Stemmer") juga opsional: implementasi C dari algoritma
+Snowball/Porter2 yang sama dengan Porter2Stemmer, ~10-30x lebih cepat per call
+dan bisa stemming satu batch token sekaligus lewat stemWords (GIL dilepas).
+Kalau tidak tersedia, fallback ke Porter2Stemmer pure Python.
+"""
+try:
+    import Stemmer as pystemmer
+except ImportError:
+    pystemmer = None
+
+class _PyStemmerAdapter:
+    """Adapter PyStemmer ke interface .stem(token) yang dipakai QueryParser."""
+    __slots__ = ('_stemmer',)
+
+    def __init__(self, stemmer):
+        self._stemmer = stemmer
+
+    def stem(self, token):
+        return self._stemmer.stemWord(token)
+
+# Implementasi stemmer yang dipakai saat INDEXING di environment ini;
+# disimpan save() sebagai marker bersama index supaya query terhadap index
+# tersebut selalu memakai implementasi yang sama (lihat _new_stemmer)
+_STEMMER_NAME = 'pystemmer' if pystemmer is not None else 'porter2'
+
+def _new_stemmer(name=_STEMMER_NAME):
+    """
+    Bangun stemmer english berdasarkan nama implementasi. Kedua implementasi
+    tidak selalu menghasilkan stem yang identik (mis. 'exceed' dan 'bias'
+    dipertahankan PyStemmer tetapi dipotong porter2stemmer pure Python), jadi
+    index dan query yang memakai stemmer berbeda membuat term yang sebenarnya
+    ada tidak pernah ketemu. Karena itu pemilihan implementasi untuk query
+    HARUS mengikuti implementasi yang dipakai saat index dibangun, bukan
+    sekadar apa yang terpasang di environment saat query.
+    """
+    if name == 'pystemmer' and pystemmer is not None:
+        return _PyStemmerAdapter(pystemmer.Stemmer('english'))
+    return Porter2Stemmer()
+
+# Tabel translate untuk lowercase bytes A-Z -> a-z dalam satu C-level pass
+_LOWER = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+# Regex token dalam bytes-mode, di-compile sekali di module scope; dipakai pada
+# fallback path tanpa Numba. Bekerja langsung di atas bytes yang sudah
+# di-lowercase sehingga tidak perlu decode UTF-8 dan str.lower() per dokumen.
+_TOKEN_RE = re.compile(rb'[a-z0-9_]+')
+
+if njit is not None:
+    @njit(cache=True)
+    def _find_token_offsets(buf, offsets):
+        """
+        Scan buffer bytes (sudah lowercase) dan tulis pasangan offset
+        (start, end) setiap token [a-z0-9_]+ ke array offsets.
+        Mengembalikan banyaknya token yang ditemukan.
+        """
+        n = buf.shape[0]
+        num_tokens = 0
+        start = -1
+        for i in range(n):
+            c = buf[i]
+            is_word = (97 <= c <= 122) or (48 <= c <= 57) or c == 95
+            if is_word:
+                if start < 0:
+                    start = i
+            elif start >= 0:
+                offsets[num_tokens, 0] = start
+                offsets[num_tokens, 1] = i
+                num_tokens += 1
+                start = -1
+        if start >= 0:
+            offsets[num_tokens, 0] = start
+            offsets[num_tokens, 1] = n
+            num_tokens += 1
+        return num_tokens
+else:
+    _find_token_offsets = None
+
+def _tokenize(data):
+    """
+    Tokenisasi isi sebuah dokumen (raw bytes) menjadi list of lowercase token.
+    Memakai kernel Numba kalau tersedia, kalau tidak fallback ke regex.
+    """
+    lowered = data.translate(_LOWER)
+    if _find_token_offsets is not None:
+        buf = np.frombuffer(lowered, dtype=np.uint8)
+        # Worst case: token 1 karakter dipisah 1 delimiter
+        offsets = np.empty((len(lowered) // 2 + 1, 2), dtype=np.int32)
+        num_tokens = _find_token_offsets(buf, offsets)
+        return [lowered[offsets[i, 0]:offsets[i, 1]].decode('ascii')
+                    for i in range(num_tokens)]
+    return [token.decode('ascii') for token in _TOKEN_RE.findall(lowered)]
+
+# State untuk worker process: dibangun sekali per process (lazy), bukan per block.
+# IdMap TIDAK bisa di-share antar process, jadi worker hanya bekerja dengan string;
+# assignment termID/docID tetap tersentralisasi di main process.
+_worker_stopword_index = None
+_worker_stemmer = None
+_worker_stem_cache = None
+
+_EMPTY_FROZENSET = frozenset()
+
+def _build_stopword_index(stopword_list):
+    """
+    Pre-index stopwords berdasarkan (panjang, huruf pertama). Tes keanggotaan
+    per token menjadi satu dict get dengan key kecil; mayoritas token non-
+    stopword jatuh ke frozenset kosong dan langsung keluar tanpa hashing
+    string panjang.
+    """
+    index = {}
+    for word in stopword_list:
+        key = (len(word), word[0])
+        index[key] = index.get(key, _EMPTY_FROZENSET) | {word}
+    return index
+
+def _read_bytes(file_path):
+    """
+    Baca seluruh isi sebuah file sebagai bytes, dengan hint sekuensial ke
+    kernel supaya read-ahead agresif. Dipanggil dari thread pool I/O di
+    parse_block_worker; open/read melepas GIL sehingga pembacaan file
+    berikutnya overlap dengan tokenisasi/stemming file saat ini.
+    """
+    with open(file_path, 'rb', buffering=0) as f:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return f.read()
+
+def parse_block_worker(args):
+    """
+    Lakukan parsing terhadap satu block (tokenisasi, pembuangan stopwords,
+    stemming) di worker process. Mengembalikan pasangan berbasis STRING
+    <stemmed_token, doc_name>, karena IdMap tidak aman di-share antar process;
+    mapping ke termID/docID dilakukan di main process.
+
+    Parameters
+    ----------
+    args : Tuple[str, str]
+        Pasangan (data_path, block_path).
+
+    Returns
+    -------
+    Tuple[str, List[Tuple[str, str]]]
+        Pasangan (block_path, list of <stemmed_token, doc_name> pairs).
+    """
+    global _worker_stopword_index, _worker_stemmer, _worker_stem_cache
+    if _worker_stemmer is None:
+        _worker_stopword_index = _build_stopword_index(stopwords.words('english'))
+        if pystemmer is not None:
+            _worker_stemmer = pystemmer.Stemmer('english')
+        else:
+            _worker_stemmer = Porter2Stemmer()
+        _worker_stem_cache = {}
+    data_path, block_path = args
+
+    token_doc_pairs = []
+    full_block_path = os.path.join(data_path, block_path)
+    stopword_index = _worker_stopword_index
+    stem_cache = _worker_stem_cache
+    # os.scandir mengembalikan DirEntry dengan hasil stat yang sudah di-cache,
+    # jadi tidak ada syscall stat tambahan per file seperti pada os.walk
+    entries = sorted((entry for entry in os.scandir(full_block_path) if entry.is_file()),
+                     key=lambda entry: entry.name)
+    # File dibaca lewat thread pool supaya disk latency overlap dengan
+    # tokenisasi/stemming dokumen yang sudah terbaca (I/O-bound, GIL dilepas
+    # selama open/read)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as io_pool:
+        read_futures = [io_pool.submit(_read_bytes, entry.path) for entry in entries]
+        for entry, read_future in zip(entries, read_futures):
+            doc_name = entry.name
+            tokens = _tokenize(read_future.result())
+            # Stem semua unique token yang belum ada di cache dalam SATU
+            # batched call (PyStemmer memproses seluruh list di C); fallback
+            # pure Python tetap per token
+            new_tokens = [token for token in set(tokens)
+                              if token not in stem_cache
+                              and token not in stopword_index.get((len(token), token[0]),
+                                                                  _EMPTY_FROZENSET)]
+            if new_tokens:
+                if pystemmer is not None:
+                    stem_cache.update(zip(new_tokens, _worker_stemmer.stemWords(new_tokens)))
+                else:
+                    for token in new_tokens:
+                        stem_cache[token] = _worker_stemmer.stem(token)
+            for token in tokens:
+                # Stopwords tidak pernah masuk cache, jadi get() None berarti skip
+                stemmed = stem_cache.get(token)
+                if stemmed is not None:
+                    token_doc_pairs.append((stemmed, doc_name))
+    return block_path, token_doc_pairs
+
 class BSBIIndex:
     """
     Attributes
@@ -30,6 +235,14 @@ class BSBIIndex:
                     VBEPostings, dsb.
     index_name(str): Nama dari file yang berisi inverted index
     """
+
+    # Batas banyaknya pasangan <termID, docID> yang di-invert di memori
+    # sekaligus oleh write_to_index. Di atas batas ini, block dipecah menjadi
+    # beberapa sorted sub-run di disk yang kemudian di-k-way-merge, sehingga
+    # pemakaian memori inversion ter-bound berapapun ukuran block (external
+    # run formation ala SPIMI)
+    MAX_PAIRS_IN_MEMORY = 10_000_000
+
     def __init__(self, data_path, output_path, postings_encoding, index_name = "main_index"):
         self.term_id_map = IdMap()
         self.doc_id_map = IdMap()
@@ -38,6 +251,15 @@ class BSBIIndex:
         self.index_name = index_name
         self.postings_encoding = postings_encoding
 
+        # Stopword set dibangun sekali per instance dan dipakai ulang oleh
+        # parse_query untuk setiap query, bukan dibangun per call. Stemmer
+        # untuk query di-resolve lazy dari marker yang disimpan bersama index
+        # (lihat _query_stemmer), karena harus mengikuti stemmer yang dipakai
+        # saat index dibangun. Untuk indexing, worker process membangun
+        # state-nya sendiri (lihat parse_block_worker).
+        self.stopword_set = set(stopwords.words('english'))
+        self.stemmer = None
+
         # Untuk menyimpan nama-nama file dari semua intermediate inverted index
         self.intermediate_indices = []
 
@@ -50,20 +272,52 @@ class BSBIIndex:
         }
 
     def save(self):
-        """Menyimpan doc_id_map and term_id_map ke output directory via pickle"""
-
-        with open(os.path.join(self.output_path, 'terms.dict'), 'wb') as f:
-            pickle.dump(self.term_id_map, f)
-        with open(os.path.join(self.output_path, 'docs.dict'), 'wb') as f:
-            pickle.dump(self.doc_id_map, f)
+        """
+        Menyimpan doc_id_map and term_id_map ke output directory dalam format
+        packed (strings + offsets) yang bisa di-mmap, lihat IdMap.save_packed
+        """
+        self.term_id_map.save_packed(os.path.join(self.output_path, 'terms'))
+        self.doc_id_map.save_packed(os.path.join(self.output_path, 'docs'))
+        # Catat stemmer yang dipakai saat indexing supaya parse_query terhadap
+        # index ini memakai implementasi yang sama (lihat _query_stemmer)
+        with open(os.path.join(self.output_path, 'stemmer.txt'), 'w') as f:
+            f.write(_STEMMER_NAME)
 
     def load(self):
-        """Memuat doc_id_map and term_id_map dari output directory"""
+        """
+        Memuat doc_id_map and term_id_map dari output directory. File strings
+        di-mmap sehingga load near-instant; dict str -> id dibangun lazy saat
+        lookup pertama (lihat IdMap.load_packed).
+
+        Index lama yang dibuat sebelum ada packed format hanya punya pickle
+        terms.dict/docs.dict; kalau terms.off tidak ada, fallback membaca
+        pickle tersebut supaya artifact lama tetap bisa di-query tanpa
+        re-indexing.
+        """
+        if os.path.exists(os.path.join(self.output_path, 'terms.off')):
+            self.term_id_map = IdMap.load_packed(os.path.join(self.output_path, 'terms'))
+            self.doc_id_map = IdMap.load_packed(os.path.join(self.output_path, 'docs'))
+        else:
+            with open(os.path.join(self.output_path, 'terms.dict'), 'rb') as f:
+                self.term_id_map = pickle.load(f)
+            with open(os.path.join(self.output_path, 'docs.dict'), 'rb') as f:
+                self.doc_id_map = pickle.load(f)
 
-        with open(os.path.join(self.output_path, 'terms.dict'), 'rb') as f:
-            self.term_id_map = pickle.load(f)
-        with open(os.path.join(self.output_path, 'docs.dict'), 'rb') as f:
-            self.doc_id_map = pickle.load(f)
+    def _query_stemmer(self):
+        """
+        Stemmer yang dipakai parse_query, dibangun sekali per instance
+        berdasarkan marker stemmer.txt yang disimpan save() bersama index.
+        Index lama tanpa marker dibangun dengan porter2stemmer pure Python,
+        jadi itu default-nya ketika marker tidak ada.
+        """
+        if self.stemmer is None:
+            marker_path = os.path.join(self.output_path, 'stemmer.txt')
+            name = 'porter2'
+            if os.path.exists(marker_path):
+                with open(marker_path) as f:
+                    name = f.read().strip()
+            self.stemmer = _new_stemmer(name)
+        return self.stemmer
 
     def start_indexing(self):
         """
@@ -76,23 +330,54 @@ class BSBIIndex:
         di setiap block dan menyimpannya ke index yang baru.
         """
         start_time = time.time()
-        # loop untuk setiap sub-directory di dalam folder collection (setiap block)
-        for block_path in tqdm(sorted(next(os.walk(self.data_path))[1])):
-            block_start_time = time.time()
-            td_pairs = self.parsing_block(block_path)
-            block_parsing_time = time.time() - block_start_time
-            self.timing_stats['parsing_blocks'] += block_parsing_time
-
-            index_id = 'intermediate_index_'+block_path
-            self.intermediate_indices.append(index_id)
+        block_paths = sorted(next(os.walk(self.data_path))[1])
+        # Parsing block bersifat CPU-bound dan setiap block independen, jadi
+        # parsing dijalankan paralel di beberapa process. Main process menerima
+        # hasil per block (berbasis string), melakukan assignment termID/docID
+        # secara tersentralisasi, lalu menulis intermediate index; penulisan
+        # block N overlap dengan parsing block-block berikutnya.
+        # Penulisan intermediate index (I/O-heavy) dijalankan di thread terpisah
+        # dengan bounded queue, supaya penulisan block N overlap dengan
+        # mapping/parsing block N+1. write_to_index didominasi I/O sehingga GIL
+        # cukup sering dilepas untuk overlap yang nyata.
+        write_queue = queue.Queue(maxsize=2)
+        self._writer_error = None
+        writer_thread = threading.Thread(target=self._index_writer_loop, args=(write_queue,))
+        writer_thread.start()
+
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = [executor.submit(parse_block_worker, (self.data_path, block_path))
+                               for block_path in block_paths]
+                # Hasil dikonsumsi dalam URUTAN SUBMIT, bukan urutan selesai:
+                # assignment termID/docID mengikuti urutan block yang sorted
+                # sehingga index hasil rebuild deterministik antar run.
+                # Parsing tetap paralel penuh; block yang selesai duluan
+                # menunggu sebentar di future-nya sampai gilirannya dipetakan.
+                for future in tqdm(futures):
+                    if self._writer_error is not None:
+                        break # writer gagal; hentikan produksi, error dilempar di bawah
+                    block_start_time = time.time()
+                    block_path, token_doc_pairs = future.result()
+                    td_pairs = self.map_td_pairs(token_doc_pairs)
+                    block_parsing_time = time.time() - block_start_time
+                    self.timing_stats['parsing_blocks'] += block_parsing_time
+
+                    index_id = 'intermediate_index_'+block_path
+                    self.intermediate_indices.append(index_id)
+                    write_queue.put((index_id, td_pairs))
+                    td_pairs = None
+        finally:
+            # Sentinel menandakan end-of-stream dan SELALU dikirim, juga saat
+            # ada worker yang raise -- tanpa ini writer thread (non-daemon)
+            # menggantung selamanya di queue.get() dan proses tidak pernah
+            # keluar. Setelah error, writer hanya men-drain queue sehingga
+            # put() di sini tidak bisa block.
+            write_queue.put(None)
+            writer_thread.join()
+        if self._writer_error is not None:
+            raise self._writer_error
 
-            write_start_time = time.time()
-            with InvertedIndexWriter(index_id, self.postings_encoding, path = self.output_path) as index:
-                self.write_to_index(td_pairs, index)
-                td_pairs = None
-            write_time = time.time() - write_start_time
-            self.timing_stats['writing_indices'] += write_time
-    
         self.save()
 
         print("Starting index merging...")
@@ -116,6 +401,36 @@ class BSBIIndex:
         print(f"Writing indices: {self.timing_stats['writing_indices']:.2f}s ({self.timing_stats['writing_indices']/total_time*100:.1f}%)")
         print(f"Merging indices: {self.timing_stats['merging_indices']:.2f}s ({self.timing_stats['merging_indices']/total_time*100:.1f}%)")
 
+    def _index_writer_loop(self, write_queue):
+        """
+        Loop untuk writer thread: ambil pasangan (index_id, td_pairs) dari
+        write_queue dan tulis sebagai intermediate index, sampai menerima
+        sentinel None yang menandakan end-of-stream.
+
+        Parameters
+        ----------
+        write_queue: queue.Queue
+            Bounded queue berisi pasangan (index_id, td_pairs) dari main thread
+        """
+        while True:
+            item = write_queue.get()
+            if item is None:
+                break
+            if self._writer_error is not None:
+                # Sudah pernah gagal: buang item berikutnya (drain) supaya
+                # main thread tidak deadlock di put() pada bounded queue;
+                # error dilempar ulang oleh start_indexing setelah join()
+                continue
+            index_id, td_pairs = item
+            write_start_time = time.time()
+            try:
+                with InvertedIndexWriter(index_id, self.postings_encoding, path = self.output_path) as index:
+                    self.write_to_index(td_pairs, index)
+                    td_pairs = None
+            except BaseException as e:
+                self._writer_error = e
+            self.timing_stats['writing_indices'] += time.time() - write_start_time
+
     def parsing_block(self, block_path):
         """
         Lakukan parsing terhadap text file sehingga menjadi sequence of
@@ -141,57 +456,124 @@ class BSBIIndex:
 
         Returns
         -------
-        List[Tuple[Int, Int]]
+        Tuple[np.ndarray, np.ndarray]
             Returns all the td_pairs extracted from the block
-            Mengembalikan semua pasangan <termID, docID> dari sebuah block (dalam hal
-            ini sebuah sub-direktori di dalam folder collection)
+            Mengembalikan semua pasangan <termID, docID> dari sebuah block (dalam
+            hal ini sebuah sub-direktori di dalam folder collection) sebagai dua
+            parallel array int32 (term_ids, doc_ids)
 
         Harus menggunakan self.term_id_map dan self.doc_id_map untuk mendapatkan
         termIDs dan docIDs. Dua variable ini harus persis untuk semua pemanggilan
         parse_block(...).
         """
-        td_pairs = []
-        full_block_path = os.path.join(self.data_path, block_path)
-        stopword_set = set(stopwords.words('english'))
-        stemmer = Porter2Stemmer()
-        for doc_name in tqdm(sorted(next(os.walk(full_block_path))[2])):
-            file_path = os.path.join(full_block_path, doc_name)
-            doc_id = self.doc_id_map[doc_name]
-            with open(file_path, 'r') as f:
-                content = f.read()
-                tokens = re.findall(r'\w+', content.lower())
-                for token in tokens:
-                    if token not in stopword_set:
-                        stemmed = stemmer.stem(token)
-                        term_id = self.term_id_map[stemmed]
-                        td_pairs.append((term_id, doc_id))
-        return td_pairs
+        _, token_doc_pairs = parse_block_worker((self.data_path, block_path))
+        return self.map_td_pairs(token_doc_pairs)
+
+    def map_td_pairs(self, token_doc_pairs):
+        """
+        Petakan pasangan berbasis string <stemmed_token, doc_name> (keluaran
+        parse_block_worker) menjadi pasangan <termID, docID> menggunakan
+        self.term_id_map dan self.doc_id_map. HARUS dijalankan di main process
+        supaya assignment ID konsisten untuk semua block.
+
+        Parameters
+        ----------
+        token_doc_pairs: List[Tuple[str, str]]
+            List of <stemmed_token, doc_name> pairs dari sebuah block
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Dua parallel array int32 (term_ids, doc_ids). Layout
+            structure-of-arrays ini memakan 8 byte per pasangan, bukan 56 byte
+            seperti list of tuples, dan bisa langsung di-sort secara vectorized.
+        """
+        term_id_map = self.term_id_map
+        doc_id_map = self.doc_id_map
+        # Assign id untuk semua term baru di block ini secara bulk: satu
+        # set.difference terhadap vocabulary yang sudah ada, lalu satu update.
+        # Lookup per pasangan selanjutnya adalah murni dict lookup tanpa
+        # branch assignment
+        unique_terms = {token for token, _ in token_doc_pairs}
+        new_terms = unique_terms - term_id_map.keys()
+        start_id = len(term_id_map)
+        term_id_map.update({term: start_id + i for i, term in enumerate(new_terms)})
+        term_str_to_id = term_id_map.str_to_id
+
+        term_buffer = array.array('i')
+        doc_buffer = array.array('i')
+        for token, doc_name in token_doc_pairs:
+            term_buffer.append(term_str_to_id[token])
+            doc_buffer.append(doc_id_map[doc_name])
+        term_ids = np.frombuffer(term_buffer, dtype=np.int32)
+        doc_ids = np.frombuffer(doc_buffer, dtype=np.int32)
+        return term_ids, doc_ids
 
     def write_to_index(self, td_pairs, index):
         """
-        Melakukan inversion td_pairs (list of <termID, docID> pairs) dan
-        menyimpan mereka ke index. Disini diterapkan konsep BSBI dimana 
-        hanya di-mantain satu dictionary besar untuk keseluruhan block.
-        Namun dalam teknik penyimpanannya digunakan srategi dari SPIMI
-        yaitu penggunaan struktur data hashtable (dalam Python bisa
-        berupa Dictionary)
+        Melakukan inversion td_pairs (parallel arrays term_ids/doc_ids) dan
+        menyimpan mereka ke index. Disini diterapkan konsep BSBI dimana
+        satu kali np.lexsort (vectorized, di level C) terhadap seluruh pasangan
+        <termID, docID> langsung menghasilkan postings list terurut per term;
+        batas antar term ditemukan lewat np.diff dan duplikat docID dibuang
+        dengan np.unique per slice, tanpa hashtable dan set perantara.
 
         ASUMSI: td_pairs CUKUP di memori
 
         Parameters
         ----------
-        td_pairs: List[Tuple[Int, Int]]
-            List of termID-docID pairs
+        td_pairs: Tuple[np.ndarray, np.ndarray]
+            Parallel arrays int32 (term_ids, doc_ids)
         index: InvertedIndexWriter
             Inverted index pada disk (file) yang terkait dengan suatu "block"
         """
-        term_dict = {}
-        for term_id, doc_id in td_pairs:
-            if term_id not in term_dict:
-                term_dict[term_id] = set()
-            term_dict[term_id].add(doc_id)
-        for term_id in sorted(term_dict.keys()):
-            index.append(term_id, sorted(list(term_dict[term_id])))
+        term_ids, doc_ids = td_pairs
+        if term_ids.size == 0:
+            return
+        if term_ids.size <= self.MAX_PAIRS_IN_MEMORY:
+            self._invert_write_run(term_ids, doc_ids, index)
+            return
+
+        # Block terlalu besar untuk di-invert sekaligus: pecah menjadi
+        # sub-run terurut di disk, lalu k-way-merge semua run ke index tujuan
+        run_ids = []
+        for run_number, start in enumerate(range(0, term_ids.size, self.MAX_PAIRS_IN_MEMORY)):
+            end = start + self.MAX_PAIRS_IN_MEMORY
+            run_id = index.index_name + '_run' + str(run_number)
+            run_ids.append(run_id)
+            with InvertedIndexWriter(run_id, self.postings_encoding, path=self.output_path) as run_index:
+                self._invert_write_run(term_ids[start:end], doc_ids[start:end], run_index)
+        with contextlib.ExitStack() as stack:
+            runs = [stack.enter_context(InvertedIndexReader(run_id, self.postings_encoding, path=self.output_path))
+                        for run_id in run_ids]
+            self.merge_index(runs, index)
+        for run_id in run_ids:
+            os.remove(os.path.join(self.output_path, run_id + '.index'))
+            os.remove(os.path.join(self.output_path, run_id + '.dict'))
+
+    def _invert_write_run(self, term_ids, doc_ids, index):
+        """
+        Lakukan inversion satu run (parallel arrays term_ids/doc_ids yang
+        muat di memori) dan tulis hasilnya ke index.
+
+        Parameters
+        ----------
+        term_ids: np.ndarray
+        doc_ids: np.ndarray
+            Parallel arrays int32 berisi pasangan <termID, docID> dari run ini
+        index: InvertedIndexWriter
+            Index tujuan untuk run ini
+        """
+        order = np.lexsort((doc_ids, term_ids))
+        term_ids = term_ids[order]
+        doc_ids = doc_ids[order]
+        boundaries = np.flatnonzero(np.diff(term_ids)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [term_ids.size]))
+        for start, end in zip(starts, ends):
+            # Postings diserahkan sebagai array int32 (buffer-native), bukan
+            # list of PyLong, supaya encoder menerima input yang contiguous
+            index.append(int(term_ids[start]), np.unique(doc_ids[start:end]))
 
     def merge_index(self, indices, merged_index):
         """
@@ -219,32 +601,39 @@ class BSBIIndex:
                 heapq.heappush(min_heap, (term_id, i, postings_list))
             except StopIteration: # Skip index yang kosong
                 pass
-        
-        current_term_id, current_postings_list = -1, []
-        # Proses merging
+
+        # Proses merging. Semua entry heap dengan term_id yang sama diambil
+        # sekaligus (batch), lalu postings-nya digabung dalam satu operasi
+        # vectorized; heapreplace dipakai sebagai pengganti pasangan
+        # heappop+heappush karena hanya butuh satu kali sift, dan tidak ada
+        # tuple yang dialokasikan per operasi heap
         while min_heap:
-            # Ambil entry dengan term_id terkecil
-            term_id, i, postings_list = heapq.heappop(min_heap)
-            # Kalau sudah selesai menggabungkan postings list dari term_id sebelumnya, tulis ke merged index
-            if current_term_id != -1 and term_id != current_term_id:
-                merged_index.append(current_term_id, current_postings_list)
-                current_postings_list = []
-            current_term_id = term_id
-            # Gabungkan postings list dari semua index yang memiliki term_id yang sama
-            if not current_postings_list:
-                current_postings_list = postings_list
+            term_id = min_heap[0][0]
+            same_term_postings = []
+            while min_heap and min_heap[0][0] == term_id:
+                same_term_postings.append(min_heap[0][2])
+                # Ambil entry selanjutnya dari index yang sama
+                i = min_heap[0][1]
+                try:
+                    next_term_id, next_postings_list = next(indices[i])
+                    heapq.heapreplace(min_heap, (next_term_id, i, next_postings_list))
+                except StopIteration: # Index ini sudah habis
+                    heapq.heappop(min_heap)
+            # Gabungkan postings list dari semua index yang memiliki term_id
+            # yang sama. Setiap postings list per block sudah terurut dan
+            # unique, jadi satu k-way streaming merge (heapq.merge) plus satu
+            # linear pass untuk dedup sudah optimal -- tidak perlu re-sort
+            # hasil concatenation
+            if len(same_term_postings) == 1:
+                merged_postings_list = same_term_postings[0]
             else:
-                current_postings_list = sort_union_list(current_postings_list, postings_list)
-            # Ambil entry selanjutnya dari index yang sama
-            try:
-                next_term_id, next_postings_list = next(indices[i])
-                heapq.heappush(min_heap, (next_term_id, i, next_postings_list))
-            except StopIteration: # Skip index yang kosong
-                pass
-        
-        # Tulis sisa postings list yang belum ditulis
-        if current_postings_list:
-            merged_index.append(current_term_id, current_postings_list)
+                merged_postings_list = []
+                prev = -1
+                for doc_id in heapq.merge(*same_term_postings):
+                    if doc_id != prev:
+                        merged_postings_list.append(doc_id)
+                        prev = doc_id
+            merged_index.append(term_id, np.asarray(merged_postings_list, dtype=np.int32))
 
     def boolean_retrieve(self, query):
         """
@@ -277,39 +666,79 @@ class BSBIIndex:
 
         JANGAN LEMPAR ERROR/EXCEPTION untuk terms yang TIDAK ADA di collection.
         """
-        query_parser = QueryParser(query, Porter2Stemmer(), set(stopwords.words('english')))
+        return self.boolean_retrieve_ast(self.parse_query(query))
+
+    def parse_query(self, query):
+        """
+        Parse sebuah query boolean menjadi representasi postfix (RPN) yang
+        siap dievaluasi oleh boolean_retrieve_ast. Parsing dipisah dari
+        evaluasi supaya query yang sama bisa di-parse SEKALI lalu hasilnya
+        dipakai ulang di beberapa index (misalnya membandingkan codec VBE
+        vs Simple-8b di search.py).
+
+        Parameters
+        ----------
+        query: str
+            Query tokens yang dipisahkan oleh spasi, boleh mengandung
+            operator AND, OR, dan DIFF serta tanda kurung untuk presedensi.
+
+        Returns
+        -------
+        List[str] atau None
+            Representasi postfix dari query; None jika query tidak valid
+            (misalnya mengandung stopwords).
+        """
+        query_parser = QueryParser(query, self._query_stemmer(), self.stopword_set)
         if not query_parser.is_valid():
+            return None
+        return query_parser.infix_to_postfix()
+
+    def boolean_retrieve_ast(self, postfix_query):
+        """
+        Evaluasi representasi postfix hasil parse_query terhadap index ini.
+        Lihat boolean_retrieve untuk kontrak hasil; postfix_query bernilai
+        None (query tidak valid) menghasilkan list kosong.
+        """
+        if postfix_query is None:
             return []
-        postfix_query = query_parser.infix_to_postfix()
+        operators = {'AND', 'OR', 'DIFF'}
 
         self.load()
-        
+
+        # Operand di stack disimpan sebagai np.int32 array terurut (unique),
+        # sehingga operasi himpunan AND/OR/DIFF berjalan vectorized di level C
+        # (np.intersect1d/np.union1d/np.setdiff1d), bukan merge per elemen
+        # di interpreter
+        empty = np.empty(0, dtype=np.int32)
         stack = []
-        for token in postfix_query:
-            if token not in query_parser.special_tokens:
-                term_id = self.term_id_map[token] if token in self.term_id_map else -1
-                if term_id == -1: # Term tidak ada di collection
-                    stack.append([])
-                else:
-                    try:
-                        with InvertedIndexReader(self.index_name, self.postings_encoding, path=self.output_path) as index:
+        # Index reader dibuka SEKALI untuk seluruh evaluasi query, bukan
+        # per term; membuka file dan parsing metadata berulang-ulang adalah
+        # overhead murni di critical path latency query
+        with InvertedIndexReader(self.index_name, self.postings_encoding, path=self.output_path) as index:
+            for token in postfix_query:
+                if token not in operators:
+                    term_id = self.term_id_map[token] if token in self.term_id_map else -1
+                    if term_id == -1: # Term tidak ada di collection
+                        stack.append(empty)
+                    else:
+                        try:
                             postings_list = index.get_postings_list(term_id)
-                            stack.append(postings_list)
-                    except: # Term ada tapi tidak ada postings list-nya
-                        stack.append([])
-            else:
-                right = stack.pop()
-                left = stack.pop()
-                if token == 'AND':
-                    stack.append(sort_intersect_list(left, right))
-                elif token == 'OR':
-                    stack.append(sort_union_list(left, right))
-                elif token == 'DIFF':
-                    stack.append(sort_diff_list(left, right))
+                            stack.append(np.asarray(postings_list, dtype=np.int32))
+                        except: # Term ada tapi tidak ada postings list-nya
+                            stack.append(empty)
+                else:
+                    right = stack.pop()
+                    left = stack.pop()
+                    if token == 'AND':
+                        stack.append(np.intersect1d(left, right, assume_unique=True))
+                    elif token == 'OR':
+                        stack.append(np.union1d(left, right))
+                    elif token == 'DIFF':
+                        stack.append(np.setdiff1d(left, right, assume_unique=True))
 
         if stack:
             result_doc_ids = stack.pop()
-            return [self.doc_id_map[doc_id] for doc_id in result_doc_ids]
+            return [self.doc_id_map[int(doc_id)] for doc_id in result_doc_ids]
         else:
             return []
 
@@ -1,15 +1,39 @@
-import array
+import struct
+import numpy as np
+
+# Format blok 64-bit Simple-8b (little-endian, sesuai byte order native
+# x86/ARM sehingga load/store tidak butuh bswap). struct.Struct meng-cache
+# hasil parsing format string dan pack_into/unpack_from bekerja in-place
+# tanpa alokasi bytes per blok
+_BLK = struct.Struct('<Q')
+
+"""
+Numba bersifat opsional: kalau tersedia, encode/decode Simple-8b memakai
+kernel @njit yang bekerja per blok 64-bit dalam instruksi native; kalau tidak,
+fallback ke implementasi pure Python di bawah.
+"""
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+"""
+pyfastpfor (binding ke library FastPFor-nya Lemire, decoder C++/SIMD) juga
+opsional: kalau terpasang, tersedia codec FastPForPostings di bawah. Codec
+VBE/Simple-8b pure Python tetap menjadi baseline yang selalu ada.
+"""
+try:
+    import pyfastpfor
+except ImportError:
+    pyfastpfor = None
 
 class StandardPostings:
     """ 
     Class dengan static methods, untuk mengubah representasi postings list
     yang awalnya adalah List of integer, berubah menjadi sequence of bytes.
-    Kita menggunakan Library array di Python.
+    Kita menggunakan NumPy dengan dtype uint32 little-endian eksplisit.
 
     ASUMSI: postings_list untuk sebuah term MUAT di memori!
-
-    Silakan pelajari:
-        https://docs.python.org/3/library/array.html
     """
 
     @staticmethod
@@ -27,10 +51,12 @@ class StandardPostings:
         bytes
             bytearray yang merepresentasikan urutan integer di postings_list
         """
-        # Untuk yang standard, gunakan L untuk unsigned long, karena docID
-        # tidak akan negatif. Dan kita asumsikan docID yang paling besar
-        # cukup ditampung di representasi 4 byte unsigned.
-        return array.array('L', postings_list).tobytes()
+        # Gunakan uint32 little-endian eksplisit: docID tidak akan negatif
+        # dan kita asumsikan docID yang paling besar cukup ditampung di
+        # representasi 4 byte unsigned. Format 'L' yang lama mengikuti ukuran
+        # C unsigned long (8 byte di Linux 64-bit), jadi boros 2x bandwidth
+        # dan tidak portabel antar platform.
+        return np.asarray(postings_list, dtype='<u4').tobytes()
 
     @staticmethod
     def decode(encoded_postings_list):
@@ -48,9 +74,27 @@ class StandardPostings:
         List[int]
             list of docIDs yang merupakan hasil decoding dari encoded_postings_list
         """
-        decoded_postings_list = array.array('L')
-        decoded_postings_list.frombytes(encoded_postings_list)
-        return decoded_postings_list.tolist()
+        return StandardPostings.decode_array(encoded_postings_list).tolist()
+
+    @staticmethod
+    def decode_array(encoded_postings_list):
+        """
+        Seperti decode, tetapi mengembalikan np.ndarray view zero-copy di atas
+        bytes input -- tidak ada copy dan tidak ada boxing PyLong per elemen.
+        Dipakai consumer yang bisa bekerja langsung dengan array (misalnya
+        operasi himpunan NumPy di boolean_retrieve).
+
+        Returns
+        -------
+        np.ndarray
+            array of docIDs (uint32 little-endian, sesuai format encode)
+        """
+        return np.frombuffer(encoded_postings_list, dtype='<u4')
+
+    @staticmethod
+    def decode_np(encoded_postings_list):
+        """Nama seragam antar codec untuk decode yang mengembalikan ndarray."""
+        return StandardPostings.decode_array(encoded_postings_list)
 
 
 class VBEPostings:
@@ -89,11 +133,34 @@ class VBEPostings:
         bytes
             bytearray yang merepresentasikan urutan integer di postings_list
         """
-        gap_based_list = [postings_list[0]]
-        for i in range(1, len(postings_list)):
-            gap_based_list.append(postings_list[i] - postings_list[i-1])
-        return VBEPostings.vb_encode(gap_based_list)
-    
+        # Fused single pass: gap dihitung inline dan byte VB langsung ditulis
+        # ke output, tanpa membangun gap_based_list perantara. Byte per integer
+        # ditulis kanan-ke-kiri ke scratch buffer 10-byte (muat int 64-bit),
+        # menghindari pola insert(0, ...) yang kuadratik
+        out = bytearray()
+        scratch = bytearray(10)
+        prev = 0
+        for posting in postings_list:
+            gap = posting - prev
+            prev = posting
+            # Fast path untuk kasus paling umum: pada postings list yang padat,
+            # mayoritas gap < 128 dan cukup satu byte -- langsung append tanpa
+            # menyentuh scratch buffer
+            if gap < 128:
+                out.append(gap | 0x80)
+                continue
+            i = 10
+            while True:
+                i -= 1
+                scratch[i] = gap & 0x7F
+                if gap < 128:
+                    break
+                gap >>= 7
+            scratch[9] |= 0x80 # set MSB of the last byte
+            out += scratch[i:10]
+        return out
+
+
     @staticmethod
     def vb_encode(list_of_numbers):
         """ 
@@ -111,14 +178,29 @@ class VBEPostings:
         Encodes a number using Variable-Byte Encoding
         Lihat buku teks kita!
         """
-        bytes = []
+        # Fast paths untuk kasus 1-3 byte yang mendominasi gap-based list:
+        # byte dirakit langsung tanpa loop maupun list perantara
+        if number < 0x80:
+            return bytes(((number | 0x80),))
+        if number < 0x4000:
+            return bytes(((number >> 7) & 0x7F, (number & 0x7F) | 0x80))
+        if number < 0x200000:
+            return bytes(((number >> 14) & 0x7F, (number >> 7) & 0x7F,
+                          (number & 0x7F) | 0x80))
+        # General fallback untuk number besar (jarang terjadi): tulis
+        # kanan-ke-kiri ke buffer 10-byte (muat int 64-bit) lalu slice,
+        # menghindari pola insert(0, ...) yang kuadratik -- pola yang sama
+        # dengan loop utama di encode
+        buf = bytearray(10)
+        i = 10
         while True:
-            bytes.insert(0, number & 0x7F) # number % 128
+            i -= 1
+            buf[i] = number & 0x7F # number % 128
             if number < 128:
                 break
             number = number >> 7 # number // 128
-        bytes[-1] |= 0x80 # set MSB of the last byte
-        return bytes
+        buf[9] |= 0x80 # set MSB of the last byte
+        return bytes(buf[i:10])
 
     @staticmethod
     def decode(encoded_postings_list):
@@ -138,28 +220,47 @@ class VBEPostings:
         List[int]
             list of docIDs yang merupakan hasil decoding dari encoded_postings_list
         """
-        gap_based_list = VBEPostings.vb_decode(encoded_postings_list)
-        postings_list = [gap_based_list[0]]
-        for i in range(1, len(gap_based_list)):
-            postings_list.append(postings_list[i-1] + gap_based_list[i])
-        return postings_list
+        return VBEPostings.decode_np(encoded_postings_list).tolist()
+
+    @staticmethod
+    def decode_np(encoded_postings_list):
+        """
+        Seperti decode, tetapi mengembalikan np.ndarray int64 -- docID
+        tersimpan sebagai int64 contiguous tanpa boxing PyLong per elemen,
+        siap dipakai operasi himpunan NumPy di downstream.
+        """
+        return np.cumsum(VBEPostings.vb_decode(encoded_postings_list))
 
     @staticmethod
     def vb_decode(encoded_bytestream):
         """
         Decoding sebuah bytestream yang sebelumnya di-encode dengan
-        variable-byte encoding.
+        variable-byte encoding. Seluruh decoding berjalan vectorized di NumPy:
+        byte terakhir setiap integer ditandai MSB set, jadi batas antar integer
+        ditemukan sekali dengan satu comparison pass, dan nilai tiap integer
+        direkonstruksi dengan shift berbobot posisi + np.add.reduceat -- tanpa
+        loop Python per byte.
+
+        Returns
+        -------
+        np.ndarray
+            array int64 berisi hasil decoding (gap-based list)
         """
-        numbers = []
-        n = 0
-        for byte in encoded_bytestream:
-            if (byte < 128):
-                n = 128 * n + byte
-            else:
-                n = 128 * n + byte - 128
-                numbers.append(n)
-                n = 0
-        return numbers
+        buf = np.frombuffer(bytes(encoded_bytestream), dtype=np.uint8)
+        if buf.size == 0:
+            return np.empty(0, dtype=np.int64)
+        payload = (buf & 0x7F).astype(np.int64)
+        positions = np.arange(buf.size)
+        ends = np.flatnonzero(buf >= 128)
+        # Integer ke berapa setiap byte menjadi bagiannya, lalu jarak byte
+        # tersebut dari byte terakhir integer-nya (menentukan bobot 128^k)
+        integer_idx = np.searchsorted(ends, positions, side='left')
+        shifts = ends[integer_idx] - positions
+        weighted = payload << (7 * shifts)
+        starts = np.empty(ends.size, dtype=np.int64)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        return np.add.reduceat(weighted, starts)
 
 class Simple8bPostings:
     """
@@ -187,49 +288,92 @@ class Simple8bPostings:
         bytes
             bytearray yang merepresentasikan urutan integer di postings_list
         """
-        gap_based_list = [postings_list[0]]
-        for i in range(1, len(postings_list)):
-            gap_based_list.append(postings_list[i] - postings_list[i-1])
+        # Normalisasi input (list ataupun buffer int32 dari IndexWriter) ke
+        # Python int lewat tolist(); find_selector mengandalkan bit_length()
+        # milik Python int, dan blok di-pack sebagai uint64 (int64 signed
+        # bisa overflow pada payload 60-bit yang digeser)
+        arr = np.asarray(postings_list, dtype=np.int64)
+        gap_based_list = [int(arr[0])] + np.diff(arr).tolist()
         return Simple8bPostings.simple8b_encode(gap_based_list)
     
     @staticmethod
     def simple8b_encode(list_of_numbers):
         """
         Encode list of numbers menggunakan algoritma Simple-8b.
+        Memakai kernel Numba kalau tersedia; fallback pure Python kalau tidak.
         """
-        bytestream = bytearray()
+        if njit is not None:
+            numbers = np.asarray(list_of_numbers, dtype=np.int64)
+            # Upper bound: setiap blok meng-encode minimal satu integer
+            blocks = np.empty(numbers.size, dtype=np.uint64)
+            num_blocks = _s8b_encode_kernel(numbers, blocks)
+            # Format on-disk little-endian; astype dengan copy=False adalah
+            # no-op di platform little-endian (tidak ada bswap per blok)
+            return bytearray(blocks[:num_blocks].astype('<u8', copy=False).tobytes())
+        # Preallocate output dengan upper bound satu blok per integer;
+        # blok ditulis in-place dengan pack_into, tanpa bytes perantara
+        bytestream = bytearray(8 * len(list_of_numbers))
+        offset = 0
         i = 0
-        while i < len(list_of_numbers):
-            selector = Simple8bPostings.find_selector(list_of_numbers[i:])
-            bits_per_integer, integers_coded = Simple8bPostings.SELECTOR_TABLE[selector]
+        n_total = len(list_of_numbers)
+        # Hoist lookup yang dipakai setiap iterasi ke variabel lokal:
+        # atribut class / global di-resolve sekali, bukan per blok
+        _find_selector = Simple8bPostings.find_selector
+        _shift_arrays = _S8B_SHIFTS
+        _pack_into = _BLK.pack_into
+        while i < n_total:
+            selector = _find_selector(list_of_numbers, i, n_total)
             if selector == 0:
-                bytestream.extend((selector).to_bytes(8, byteorder='big'))
+                _pack_into(bytestream, offset, selector)
                 i += 240
             elif selector == 1:
-                bytestream.extend((selector).to_bytes(8, byteorder='big'))
+                _pack_into(bytestream, offset, selector)
                 i += 120
             else:
-                encoded = selector
-                for j in range(integers_coded):
-                    encoded |= (list_of_numbers[i + j] << (4 + bits_per_integer * j))
-                bytestream.extend(encoded.to_bytes(8, byteorder='big'))
-                i += integers_coded
-        return bytestream
+                # Pack seluruh payload blok lewat satu reduksi NumPy uint64:
+                # shift berjalan sebagai operasi machine-word, bukan bigint
+                # Python per |=. Karena tiap payload menempati bit disjoint,
+                # sum == bitwise OR, dan satu blok penuh (4 bit selector +
+                # maksimal 60 bit payload) selalu muat di uint64
+                shifts = _shift_arrays[selector]
+                vals = np.asarray(list_of_numbers[i:i + shifts.size], dtype=np.uint64)
+                encoded = selector | int((vals << shifts).sum(dtype=np.uint64))
+                _pack_into(bytestream, offset, encoded)
+                i += shifts.size
+            offset += 8
+        return bytestream[:offset]
 
     @staticmethod
-    def find_selector(numbers):
+    def find_selector(numbers, start, end):
         """
-        Mencari selector yang paling sesuai untuk mengompresi list of numbers.
+        Mencari selector yang paling sesuai untuk mengompresi numbers[start:end].
+        Range diberikan sebagai indeks supaya caller tidak perlu mengalokasikan
+        slice list_of_numbers[i:] (copy O(n) per blok) setiap panggilan.
         """
         # Gunakan selector 0 atau 1 untuk handle runs of 1's. (sumber: paper Simple-8b hal. 137)
-        if len(numbers) >= 240 and all(num == 1 for num in numbers[:240]):
+        # Panjang run dihitung dengan indexing langsung, tanpa slice
+        # yang mengalokasikan list baru setiap panggilan
+        run_limit = min(240, end - start)
+        leading_ones = 0
+        while leading_ones < run_limit and numbers[start + leading_ones] == 1:
+            leading_ones += 1
+        if leading_ones >= 240:
             return 0
-        if len(numbers) >= 120 and all(num == 1 for num in numbers[:120]):
+        if leading_ones >= 120:
             return 1
-        # Cek selector lainnya
+        # Cek selector lainnya. Banyaknya bit yang dibutuhkan prefix sepanjang
+        # k dihitung sekali lewat running OR (bit_length dari OR == bit_length
+        # dari max untuk integer non-negatif), jadi tidak ada max(slice) yang
+        # scan ulang prefix untuk setiap selector
+        limit = min(60, end - start)
+        prefix_bits = [0] * limit
+        running_or = 0
+        for j in range(limit):
+            running_or |= numbers[start + j]
+            prefix_bits[j] = running_or.bit_length()
         for selector in range(2, 16):
             bits_per_integer, integers_coded = Simple8bPostings.SELECTOR_TABLE[selector]
-            if len(numbers) >= integers_coded and max(numbers[:integers_coded]) < (1 << bits_per_integer):
+            if limit >= integers_coded and prefix_bits[integers_coded - 1] <= bits_per_integer:
                 return selector
         # Jika nilai terlalu besar, throw error
         raise ValueError("No suitable selector found for Simple-8b encoding, value too large")
@@ -250,36 +394,235 @@ class Simple8bPostings:
         List[int]
             list of docIDs yang merupakan hasil decoding dari encoded_postings_list
         """
-        gap_based_list = Simple8bPostings.simple8b_decode(encoded_postings_list)
-        postings_list = [gap_based_list[0]]
-        for i in range(1, len(gap_based_list)):
-            postings_list.append(postings_list[i-1] + gap_based_list[i])
-        return postings_list
+        return Simple8bPostings.decode_np(encoded_postings_list).tolist()
+
+    @staticmethod
+    def decode_np(encoded_postings_list):
+        """
+        Seperti decode, tetapi mengembalikan np.ndarray int64 -- docID
+        tersimpan sebagai int64 contiguous tanpa boxing PyLong per elemen,
+        siap dipakai operasi himpunan NumPy di downstream.
+        """
+        return np.cumsum(Simple8bPostings.simple8b_decode(encoded_postings_list))
     
     @staticmethod
     def simple8b_decode(encoded_bytestream):
         """
         Decode bytestream yang sebelumnya di-encode dengan Simple-8b.
+        Memakai kernel Numba kalau tersedia; fallback pure Python kalau tidak.
+        Mengembalikan np.ndarray int64 berisi gap-based list (seperti
+        vb_decode pada VBEPostings).
         """
-        result = []
-        # Proses bytestream per 8 bytes (64 bits / 1 block pada Simple-8b)
+        if njit is not None:
+            # Blok on-disk little-endian: frombuffer adalah view zero-copy,
+            # dan astype dengan copy=False tidak menyalin apa pun di platform
+            # little-endian
+            blocks = np.frombuffer(bytes(encoded_bytestream), dtype='<u8').astype(np.uint64, copy=False)
+            out = np.empty(blocks.size * 240, dtype=np.int64)
+            n_decoded = _s8b_decode_kernel(blocks, out)
+            return out[:n_decoded]
+        # Output di-preallocate sekali dengan upper bound banyaknya integer
+        # (240 per blok), lalu ditulis lewat indexed assignment -- tidak ada
+        # list growth maupun alokasi PyLong via append/extend per elemen
+        n_blocks = len(encoded_bytestream) // 8
+        out = np.empty(n_blocks * 240, dtype=np.int64)
+        k = 0
+        # Hoist lookup per-blok ke variabel lokal (lihat simple8b_encode)
+        _unpack_from = _BLK.unpack_from
+        _shift_arrays = _S8B_SHIFTS
+        _masks = _S8B_MASKS
+        _u64 = np.uint64
+        # Proses bytestream per 8 bytes (64 bits / 1 block pada Simple-8b);
+        # unpack_from membaca langsung dari buffer tanpa alokasi slice
         for i in range(0, len(encoded_bytestream), 8):
-            block = int.from_bytes(encoded_bytestream[i:i+8], byteorder='big')
+            block, = _unpack_from(encoded_bytestream, i)
             selector = block & 0xF
             if selector == 0:
-                result.extend([1] * 240)
+                out[k:k+240] = 1 # vectorized store
+                k += 240
             elif selector == 1:
-                result.extend([1] * 120)
+                out[k:k+120] = 1
+                k += 120
             else:
-                bits_per_integer, integers_coded = Simple8bPostings.SELECTOR_TABLE[selector]
+                # Ekstrak seluruh payload blok dalam satu operasi broadcast
+                shifts = _shift_arrays[selector]
+                out[k:k+shifts.size] = (_u64(block) >> shifts) & _masks[selector]
+                k += shifts.size
+        return out[:k]
+
+# Tabel selector sebagai array NumPy module-level supaya bisa dibaca dari
+# dalam kernel Numba (di-compile sebagai konstanta)
+_S8B_BITS = np.array([bits for bits, _ in Simple8bPostings.SELECTOR_TABLE], dtype=np.int64)
+_S8B_COUNT = np.array([count for _, count in Simple8bPostings.SELECTOR_TABLE], dtype=np.int64)
+
+# Shift dan mask per selector untuk decode vectorized: payload satu blok
+# diekstrak dengan satu broadcast (block >> shifts) & mask, menggantikan
+# sampai 60 iterasi shift+mask di interpreter. Selector 0/1 tidak membawa
+# payload sehingga entry-nya None
+_S8B_SHIFTS = [None, None] + [
+    np.array([4 + bits * j for j in range(count)], dtype=np.uint64)
+    for bits, count in Simple8bPostings.SELECTOR_TABLE[2:]
+]
+_S8B_MASKS = [None, None] + [
+    np.uint64((1 << bits) - 1) for bits, _ in Simple8bPostings.SELECTOR_TABLE[2:]
+]
+
+
+class FastPForPostings:
+    """
+    Codec opsional di atas library pyfastpfor (binding ke FastPFor-nya
+    Lemire, dengan decoder C++). API-nya sama dengan codec lain di file ini
+    (encode/decode/decode_np), jadi bisa langsung dipakai sebagai
+    encoding_method pada InvertedIndex.
+
+    Format on-disk: 4 byte uint32 little-endian berisi banyaknya postings,
+    diikuti kata-kata uint32 little-endian keluaran codec. Berbeda dengan
+    VBE/Simple-8b, bytestream FastPFor TIDAK self-delimiting -- decoder-nya
+    butuh tahu banyaknya elemen -- sehingga count harus ikut disimpan.
+
+    Hanya tersedia jika pyfastpfor terpasang.
+    """
+    # Varian 'simple8b_rle' sengaja dihindari: encodeArray-nya melaporkan
+    # ukuran compressed lebih kecil dari kata yang benar-benar ditulis,
+    # sehingga stream yang dibaca ulang dari disk terpotong
+    CODEC_NAME = 'simple8b'
+    _codec = pyfastpfor.getCodec(CODEC_NAME) if pyfastpfor is not None else None
+
+    @staticmethod
+    def encode(postings_list):
+        """
+        Encode postings_list (gap-based, seperti codec lain) menjadi stream
+        of bytes lewat codec FastPFor.
+        """
+        if pyfastpfor is None:
+            raise ImportError("FastPForPostings membutuhkan package pyfastpfor")
+        arr = np.asarray(postings_list, dtype=np.int64)
+        gaps = np.empty(arr.size, dtype=np.uint32)
+        gaps[0] = arr[0]
+        gaps[1:] = np.diff(arr)
+        # Output buffer dengan slack sesuai anjuran FastPFor (codec bisa
+        # menulis beberapa kata melebihi ukuran input pada kasus terburuk)
+        out = np.zeros(arr.size + 1024, dtype=np.uint32)
+        n_words = FastPForPostings._codec.encodeArray(gaps, gaps.size, out, out.size)
+        # Header count ditulis eksplisit little-endian, konsisten dengan
+        # '<u4' yang dibaca decode_np (tobytes() pada scalar numpy mengikuti
+        # byte order native host)
+        return struct.pack('<I', arr.size) + out[:n_words].astype('<u4', copy=False).tobytes()
+
+    @staticmethod
+    def decode(encoded_postings_list):
+        """
+        Decodes postings_list dari sebuah stream of bytes keluaran encode.
+
+        Returns
+        -------
+        List[int]
+            list of docIDs yang merupakan hasil decoding dari encoded_postings_list
+        """
+        return FastPForPostings.decode_np(encoded_postings_list).tolist()
+
+    @staticmethod
+    def decode_np(encoded_postings_list):
+        """
+        Seperti decode, tetapi mengembalikan np.ndarray int64, konsisten
+        dengan decode_np pada codec lain.
+        """
+        if pyfastpfor is None:
+            raise ImportError("FastPForPostings membutuhkan package pyfastpfor")
+        buf = bytes(encoded_postings_list)
+        n_postings = int(np.frombuffer(buf, dtype='<u4', count=1)[0])
+        comp = np.frombuffer(buf, dtype='<u4', offset=4).astype(np.uint32, copy=False)
+        gaps = np.zeros(n_postings + 1024, dtype=np.uint32)
+        FastPForPostings._codec.decodeArray(comp, comp.size, gaps, n_postings)
+        return np.cumsum(gaps[:n_postings], dtype=np.int64)
+
+if njit is not None:
+    @njit(cache=True)
+    def _s8b_encode_kernel(numbers, blocks):
+        """
+        Encode numbers (int64) menjadi blok-blok uint64 Simple-8b di array
+        blocks. Mengembalikan banyaknya blok yang ditulis.
+        """
+        i = 0
+        num_blocks = 0
+        n_total = numbers.size
+        while i < n_total:
+            # Selector 0/1 untuk runs of 1's
+            run = 0
+            while run < 240 and i + run < n_total and numbers[i + run] == 1:
+                run += 1
+            if run >= 240:
+                blocks[num_blocks] = 0
+                num_blocks += 1
+                i += 240
+                continue
+            if run >= 120:
+                blocks[num_blocks] = 1
+                num_blocks += 1
+                i += 120
+                continue
+            packed = False
+            for selector in range(2, 16):
+                bits_per_integer = _S8B_BITS[selector]
+                integers_coded = _S8B_COUNT[selector]
+                if n_total - i < integers_coded:
+                    continue
+                fits = True
                 for j in range(integers_coded):
-                    result.append((block >> (4 + bits_per_integer * j)) & ((1 << bits_per_integer) - 1))
-        return result
+                    if numbers[i + j] >= (1 << bits_per_integer):
+                        fits = False
+                        break
+                if fits:
+                    block = np.uint64(selector)
+                    shift = np.uint64(4)
+                    for j in range(integers_coded):
+                        block |= np.uint64(numbers[i + j]) << shift
+                        shift += np.uint64(bits_per_integer)
+                    blocks[num_blocks] = block
+                    num_blocks += 1
+                    i += integers_coded
+                    packed = True
+                    break
+            if not packed:
+                raise ValueError("No suitable selector found for Simple-8b encoding, value too large")
+        return num_blocks
+
+    @njit(cache=True)
+    def _s8b_decode_kernel(blocks, out):
+        """
+        Decode blok-blok uint64 Simple-8b ke array out (int64).
+        Mengembalikan banyaknya integer yang ditulis.
+        """
+        k = 0
+        for block_idx in range(blocks.size):
+            block = blocks[block_idx]
+            selector = np.int64(block & np.uint64(0xF))
+            if selector == 0:
+                for _ in range(240):
+                    out[k] = 1
+                    k += 1
+            elif selector == 1:
+                for _ in range(120):
+                    out[k] = 1
+                    k += 1
+            else:
+                bits_per_integer = _S8B_BITS[selector]
+                integers_coded = _S8B_COUNT[selector]
+                mask = (np.uint64(1) << np.uint64(bits_per_integer)) - np.uint64(1)
+                shift = np.uint64(4)
+                for _ in range(integers_coded):
+                    out[k] = np.int64((block >> shift) & mask)
+                    shift += np.uint64(bits_per_integer)
+                    k += 1
+        return k
 
 if __name__ == '__main__':
     
     postings_list = [34, 67, 89, 454, 2345738]
-    for Postings in [StandardPostings, VBEPostings, Simple8bPostings]:
+    codecs = [StandardPostings, VBEPostings, Simple8bPostings]
+    if pyfastpfor is not None:
+        codecs.append(FastPForPostings)
+    for Postings in codecs:
         # Silakan sesuaikan jika ada perbedaan parameter pada metode encode dan decode Simple8bPostings
         print(Postings.__name__)
         encoded_postings_list = Postings.encode(postings_list)
@@ -46,6 +46,7 @@ class InvertedIndex:
 
         self.encoding_method = encoding_method
         self.path = path
+        self.index_name = index_name
 
         self.index_file_path = os.path.join(path, index_name+'.index')
         self.metadata_file_path = os.path.join(path, index_name+'.dict')
@@ -127,7 +128,10 @@ class InvertedIndexReader(InvertedIndex):
 
     def get_postings_list(self, term):
         """
-        Kembalikan sebuah postings list (list of docIDs) untuk sebuah term.
+        Kembalikan sebuah postings list (np.ndarray of docIDs) untuk sebuah
+        term. Hasilnya berupa array (decode_np), bukan list of PyLong, supaya
+        consumer seperti boolean_retrieve bisa langsung memakai operasi
+        himpunan NumPy tanpa boxing per elemen.
 
         PERHATIAN! method tidak tidak boleh iterasi di keseluruhan index
         dari awal hingga akhir. Method ini harus langsung loncat ke posisi
@@ -136,7 +140,7 @@ class InvertedIndexReader(InvertedIndex):
         """
         start_position, _, length = self.postings_dict[term]
         self.index_file.seek(start_position)
-        return self.encoding_method.decode(self.index_file.read(length))
+        return self.encoding_method.decode_np(self.index_file.read(length))
 
 class InvertedIndexWriter(InvertedIndex):
     """
@@ -13,16 +13,12 @@ BSBI_instance_simple8b = BSBIIndex(data_path = 'arxiv_collections', \
 
 queries = ["(cosmological AND (quantum OR continuum)) AND geodesics"]
 for query in queries:
-    print("Query  : ", query)
-    print("Results:")
-    for doc in BSBI_instance.boolean_retrieve(query):
-        print(doc)
-    print()
-
-
-for query in queries:
-    print("Query  : ", query)
-    print("Results:")
-    for doc in BSBI_instance_simple8b.boolean_retrieve(query):
-        print(doc)
-    print()
+    # Query di-parse SEKALI; representasi postfix-nya dipakai ulang oleh
+    # kedua index sehingga perbandingan codec tidak membayar parsing dua kali
+    postfix_query = BSBI_instance.parse_query(query)
+    for instance in (BSBI_instance, BSBI_instance_simple8b):
+        print("Query  : ", query)
+        print("Results:")
+        for doc in instance.boolean_retrieve_ast(postfix_query):
+            print(doc)
+        print()
@@ -1,4 +1,6 @@
+import mmap
 import re
+import numpy as np
 
 class IdMap:
     """
@@ -25,23 +27,127 @@ class IdMap:
         self.str_to_id = {}
         self.id_to_str = []
 
+        # Diisi oleh load_packed(...): mmap dari file strings dan array offset
+        # int64. Selama keduanya terisi, id -> str dilayani langsung dari mmap
+        # (zero-copy slicing) dan dict str -> id baru dibangun saat pertama kali
+        # dibutuhkan (lazy).
+        self._packed_data = None
+        self._packed_offsets = None
+
     def __len__(self):
         """Mengembalikan banyaknya term (atau dokumen) yang disimpan di IdMap."""
+        if self._packed_data is not None:
+            return len(self._packed_offsets) - 1
         return len(self.id_to_str)
 
+    def __setstate__(self, state):
+        """
+        Dipanggil pickle saat unpickling. Pickle IdMap lama (format .dict
+        sebelum ada packed format) tidak membawa atribut _packed_*, jadi
+        lengkapi dengan default supaya instance hasil unpickle tetap valid.
+        """
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_packed_data', None)
+        self.__dict__.setdefault('_packed_offsets', None)
+
+    def save_packed(self, path_prefix):
+        """
+        Menyimpan IdMap ke dua file: <path_prefix>.txt berisi semua string
+        UTF-8 yang di-concat tanpa delimiter, dan <path_prefix>.off berisi
+        array offset int64 (n+1 entri) yang menjadi pembatas antar string.
+        Format ini bisa di-mmap saat load tanpa membangun objek per entri
+        seperti pada pickle.
+        """
+        encoded = [self[i].encode('utf-8') for i in range(len(self))]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        with open(path_prefix + '.off', 'wb') as f:
+            f.write(offsets.tobytes())
+        with open(path_prefix + '.txt', 'wb') as f:
+            f.write(b''.join(encoded))
+
+    @classmethod
+    def load_packed(cls, path_prefix):
+        """
+        Memuat IdMap dari pasangan file keluaran save_packed. File strings
+        di-mmap sehingga load bersifat near-instant; dict str -> id tidak
+        dibangun di sini, melainkan lazy saat lookup string pertama.
+        """
+        id_map = cls()
+        id_map._packed_offsets = np.fromfile(path_prefix + '.off', dtype=np.int64)
+        f = open(path_prefix + '.txt', 'rb')
+        if id_map._packed_offsets[-1] > 0:
+            id_map._packed_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else: # mmap tidak bisa memetakan file kosong
+            id_map._packed_data = b''
+        f.close()
+        return id_map
+
+    def __build_str_to_id(self):
+        """Membangun dict str -> id dari data packed (dipanggil lazy)."""
+        data = self._packed_data
+        offsets = self._packed_offsets
+        self.str_to_id = {data[offsets[i]:offsets[i+1]].decode('utf-8'): i
+                              for i in range(len(offsets) - 1)}
+
+    def __materialize(self):
+        """
+        Mengubah IdMap packed (read-only) menjadi IdMap biasa yang bisa
+        menerima string baru. Hanya terjadi pada path langka dimana string
+        yang belum dikenal di-assign id baru.
+        """
+        self.id_to_str = [self[i] for i in range(len(self))]
+        if not self.str_to_id:
+            self.__build_str_to_id()
+        self._packed_data = None
+        self._packed_offsets = None
+
+    def __contains__(self, s):
+        """Cek keanggotaan sebuah string tanpa meng-assign id baru."""
+        if self._packed_data is not None and not self.str_to_id:
+            self.__build_str_to_id()
+        return s in self.str_to_id
+
+    def keys(self):
+        """Mengembalikan view semua string yang sudah ter-assign id."""
+        if self._packed_data is not None and not self.str_to_id:
+            self.__build_str_to_id()
+        return self.str_to_id.keys()
+
+    def update(self, mapping):
+        """
+        Meng-assign id untuk banyak string baru sekaligus (bulk). id pada
+        mapping HARUS kontigu melanjutkan len(self), dalam urutan insertion
+        mapping -- seperti yang dihasilkan pola
+        {s: len(self) + i for i, s in enumerate(new_strings)}.
+        """
+        if self._packed_data is not None:
+            self.__materialize()
+        for s, i in mapping.items():
+            self.str_to_id[s] = i
+            self.id_to_str.append(s)
+
     def __get_id(self, s):
         """
         Mengembalikan integer id i yang berkorespondensi dengan sebuah string s.
         Jika s tidak ada pada IdMap, lalu assign sebuah integer id baru dan kembalikan
         integer id baru tersebut.
         """
+        if self._packed_data is not None:
+            if not self.str_to_id:
+                self.__build_str_to_id()
+            if s not in self.str_to_id:
+                self.__materialize()
         if s not in self.str_to_id:
             self.str_to_id[s] = len(self.id_to_str)
             self.id_to_str.append(s)
         return self.str_to_id[s]
-    
+
     def __get_str(self, i):
         """Mengembalikan string yang terasosiasi dengan index i."""
+        if self._packed_data is not None:
+            start, end = self._packed_offsets[i], self._packed_offsets[i+1]
+            return self._packed_data[start:end].decode('utf-8')
         return self.id_to_str[i]
 
     def __getitem__(self, key):
@@ -276,7 +382,17 @@ if __name__ == '__main__':
             "/collection/1/data53.txt"]
     doc_id_map = IdMap()
     assert [doc_id_map[docname] for docname in docs] == [0, 1, 2], "docs_id salah"
-    
+
+    term_id_map.save_packed('./tmp/test_terms')
+    packed_map = IdMap.load_packed('./tmp/test_terms')
+    assert len(packed_map) == len(term_id_map), "packed IdMap salah"
+    assert packed_map[1] == "semua", "packed IdMap salah"
+    assert "selamat" in packed_map, "packed IdMap salah"
+    assert "tidakada" not in packed_map, "packed IdMap salah"
+    assert packed_map["pagi"] == 3, "packed IdMap salah"
+    assert packed_map["baru"] == 4, "packed IdMap salah"
+
+
     assert sort_intersect_list([1, 2, 3], [2, 3]) == [2, 3], "sorted_intersect salah"
     assert sort_intersect_list([4, 5], [1, 4, 7]) == [4], "sorted_intersect salah"
     assert sort_intersect_list([], []) == [], "sorted_intersect salah"